@@ -132,10 +132,13 @@ from __future__ import with_statement
     
 """
 
-import json
-import copy
+import bisect
+import collections
 import configobj
 import math
+import re
+import functools
+import gzip
 if __name__ == "__main__":
     import optparse
     import os.path
@@ -154,6 +157,14 @@ import weeutil.weeutil
 
 SVG_ICON_START = '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" %s width="%s" height="%s" viewBox="-64 -50 128 100">%s<g stroke-width="3">'
 SVG_ICON_END = '</g></svg>'
+
+def _svg_start(coord, width, height, text):
+    """ SVG document prologue
+
+        f-string counterpart of SVG_ICON_START for the functions that
+        format the prologue at call time
+    """
+    return f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" {coord} width="{width}" height="{height}" viewBox="-64 -50 128 100">{text}<g stroke-width="3">'
 SVG_ICON_UNKNOWN = '<path stroke="#828487" fill="none" d="M -31,28 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39z" /><text x="-18" y="18" fill="#828487" style="font-family:sans-serif;font-size:50px;font-weight:normal;text-align:center">?</text>'
 SVG_ICON_CLOUDY = '<path stroke="#828487" stroke-width="1.8" fill="none" d="M 5,-30 a 14.4,14.4 0 0 1 25.8,-5.4 h 2 a 9.75,9.75 0 0 1 9,6 a 12,12 0 0 1 0.3,22.68" /><path stroke="#828487" fill="none" d="M -31,28 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39z" />'
 SVG_ICON_CLOUDY_WIND = '<path stroke="#828487" stroke-width="1.8" fill="none" d="M 5,-30 a 14.4,14.4 0 0 1 25.8,-5.4 h 2 a 9.75,9.75 0 0 1 9,6 a 12,12 0 0 1 0.3,22.68" /><path stroke="#828487" fill="none" d="M -31,28 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke-width="3.0" stroke="#404040" fill="none" d="M-23,16.5 h20.0 a6.0,6.0 0 1 0 -6.0,-6.0 M-23,24 h37.5 a6.0,6.0 0 1 0 -6.0,-6.0 M-23,31.5 h28.75 a6.0,6.0 0 1 1 -6.0,6.0" />'
@@ -161,14 +172,24 @@ SVG_ICON_FOG = '<path stroke="rgba(111,155,164,90)" stroke-linecap="round" d="M
 SVG_ICON_WIND = '<path stroke-width="6" stroke="#404040" fill="none" d="M-45,-15 h40 a12,12 0 1 0 -12,-12 M-45,0 h75 a12,12 0 1 0 -12,-12 M-45,15 h57.5 a12,12 0 1 1 -12,12" />'
 SVG_ICON_SANDSTORM = '<path stroke-width="6" stroke="#a96132" fill="none" d="M-45,-15 h40 a12,12 0 1 0 -12,-12 M-45,0 h75 a12,12 0 1 0 -12,-12 M-45,15 h57.5 a12,12 0 1 1 -12,12" />'
 SVG_ICON_BLOWINGSNOW = '<path stroke-width="6" stroke="#66a1ba" fill="none" d="M-60,-15 h40 a12,12 0 1 0 -12,-12 M-60,0 h75 a12,12 0 1 0 -12,-12 M-60,15 h57.5 a12,12 0 1 1 -12,12" /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M 30,20 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M 50,-5 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M 42,-40 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " />'
-SVG_ICON_RAIN = '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke="none" fill="#66a1ba" d="M -28,10 h 5 l 22.0,30 h -5 l -22.0,-30 z m 15,0 h 5 l 22.0,30 h -5 l -22.0,-30 z m 15,0 h 5 l 22.0,30 h -5 l -22.0,-30 z " />'
-SVG_ICON_DRIZZLE = '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke="#66a1ba" fille="none" stroke-dasharray="4 9" stroke-width="2" d="M -4.5,40 l -22,-30 m 7.5,0 l 22,30 m 7.5,0 l -22,-30 m 7.5,0 l 22,30 m 7.5,0 l -22,-30 " />'
-SVG_ICON_HAIL = '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><g stroke="none" fill="#66a1ba"><circle cx="-15" cy="37" r="4" /><circle cx="-6" cy="19" r="4" /><circle cx="11" cy="30" r="4" /></g>'
-SVG_ICON_SLEET = '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M -13,23 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" fille="none" stroke-dasharray="4 9" stroke-width="2" d="M 13.5,40 l -22,-30 m 7.5,0 l 22,30 m 7.5,0 l -22,-30 m 7.5,0 " />'
-SVG_ICON_SNOW = '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M -13,7 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M 12,0 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M 5,23 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " />'
+# fragments shared by several of the icons below: the cloud outline,
+# the rain stripes (one stripe repeated, the original drawing moves
+# 15 units right between stripes), the hailstones and the lightning
+# bolt
+_SVG_CLOUD = '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" />'
+_SVG_RAIN_STRIPES = '<path stroke="none" fill="#66a1ba" d="M -28,10 ' + ' m 15,0 '.join(('h 5 l 22.0,30 h -5 l -22.0,-30 z',)*3) + ' " />'
+_SVG_HAILSTONES = '<g stroke="none" fill="#66a1ba"><circle cx="-15" cy="37" r="4" /><circle cx="-6" cy="19" r="4" /><circle cx="11" cy="30" r="4" /></g>'
+_SVG_BOLT = '<path stroke-width="2" stroke-linejoin="round" stroke="#f6bc68" fill="#f6bc68" d="M-4,6 l9.12538211,-21.49805304 l-12.39550268,3.32136493 l7.14107222,-16.82331189 h-8.81753557 l-4.1787982,21.49805304 l12.39550268,-3.32136493 z" />'
+SVG_ICON_RAIN = _SVG_CLOUD + _SVG_RAIN_STRIPES
+SVG_ICON_DRIZZLE = _SVG_CLOUD + '<path stroke="#66a1ba" fille="none" stroke-dasharray="4 9" stroke-width="2" d="M -4.5,40 l -22,-30 m 7.5,0 l 22,30 m 7.5,0 l -22,-30 m 7.5,0 l 22,30 m 7.5,0 l -22,-30 " />'
+SVG_ICON_HAIL = _SVG_CLOUD + _SVG_HAILSTONES
+SVG_ICON_SLEET = _SVG_CLOUD + '<path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M -13,23 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" fille="none" stroke-dasharray="4 9" stroke-width="2" d="M 13.5,40 l -22,-30 m 7.5,0 l 22,30 m 7.5,0 l -22,-30 m 7.5,0 " />'
+SVG_ICON_SNOW = _SVG_CLOUD + '<path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M -13,7 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M 12,0 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " /><path stroke="#66a1ba" stroke-width="1.5" stroke-linecap="round" fill="none" d="M 5,23 l0.0,20.0 m-8.66025404,-15.0 l17.32050808,10.0 m-17.32050808,-0.0 l17.32050808,-10.0 m-8.66025404,-5.0 m2.88675135,1.66666667 l-2.88675135,1.66666667 l-2.88675135,-1.66666667 m2.88675135,-1.66666667 m-8.66025404,5.0 m2.88675135,-1.66666667 l-0.0,3.33333333 l-2.88675135,1.66666667 m0.0,-3.33333333 m-0.0,10.0 m0.0,-3.33333333 l2.88675135,1.66666667 l0.0,3.33333333 m-2.88675135,-1.66666667 m8.66025404,5.0 m-2.88675135,-1.66666667 l2.88675135,-1.66666667 l2.88675135,1.66666667 m-2.88675135,1.66666667 m8.66025404,-5.0 m-2.88675135,1.66666667 l0.0,-3.33333333 l2.88675135,-1.66666667 m-0.0,3.33333333 m0.0,-10.0 m-0.0,3.33333333 l-2.88675135,-1.66666667 l-0.0,-3.33333333 m2.88675135,1.66666667 " />'
 SVG_ICON_FREEZINGRAIN = '<path stroke="#828487" fill="none" d="M -26.349999999999998,4 m 3.4,0 h -3.4 a17.0,17.0 0 1 1 4.1482281485,-33.486121535 a20.4,20.4 0 0 1 36.7205047215,-8.067213252 a13.8125,13.8125 0 0 1 14.381267130000001,8.403334786999999 a17.0,17.0 0 0 1 -5.3082483,33.15 h -3.4" /><path stroke="none" fill="#66a1ba" d="M -27,-7 h 5 l 18.7,25.5 h -5 l -18.7,-25.5 z m 15,0 h 5 l 18.7,25.5 h -5 l -18.7,-25.5 z m 15,0 h 5 l 18.7,25.5 h -5 l -18.7,-25.5 z " /><path stroke="none" fill="#000000" d="M-9.42235138,48 l8.54455967,-4.047423 a6.04100450,6.04100450 0 0 0 2.54603347,-8.64621208 l-3.23725145,-5.21347156 a2.74580363,2.74580363 0 0 1 0.78256116,-3.71485342 l4.93895246,-3.37803994 h-1.38888889 l-5.10795449,2.93585208 a4.68254091,4.68254091 0 0 0 -2.09563466,5.5796135 l2.27226862,6.62156404 a3.29583971,3.29583971 0 0 1 -1.84474537,4.10998876 l-13.74323385,5.75298161 z m33.33333333,0 l1.22771241,-1.22771241 a6.20359314,6.20359314 0 0 0 -1.28480621,-9.75907203 l-13.55967183,-7.82868018 a3.22628070,3.22628070 0 0 1 -1.41857181,-3.89749403 l0.83241498,-2.28704135 h-1.38888889 l-0.68119443,1.08342259 a4.68254091,4.68254091 0 0 0 1.30173924,6.30605466 l12.49300857,8.59055233 a2.68888799,2.68888799 0 0 1 0.13365758,4.33313596 l-5.98873292,4.68683446 z" /><path stroke="#66a1ba" stroke-width="1.2" stroke-linecap="round" fill="none" d="M -17,26 l0.0,16.0 m-6.92820323,-12.0 l13.85640646,8.0 m-13.85640646,-0.0 l13.85640646,-8.0 m-6.92820323,-4.0 m2.30940108,1.33333333 l-2.30940108,1.33333333 l-2.30940108,-1.33333333 m2.30940108,-1.33333333 m-6.92820323,4.0 m2.30940108,-1.33333333 l-0.0,2.66666667 l-2.30940108,1.33333333 m0.0,-2.66666667 m-0.0,8.0 m0.0,-2.66666667 l2.30940108,1.33333333 l0.0,2.66666667 m-2.30940108,-1.33333333 m6.92820323,4.0 m-2.30940108,-1.33333333 l2.30940108,-1.33333333 l2.30940108,1.33333333 m-2.30940108,1.33333333 m6.92820323,-4.0 m-2.30940108,1.33333333 l0.0,-2.66666667 l2.30940108,-1.33333333 m-0.0,2.66666667 m0.0,-8.0 m-0.0,2.66666667 l-2.30940108,-1.33333333 l-0.0,-2.66666667 m2.30940108,1.33333333 " />'
 SVG_ICON_FREEZINGDRIZZLE = '<path stroke="#828487" fill="none" d="M -26.349999999999998,4 m 3.4,0 h -3.4 a17.0,17.0 0 1 1 4.1482281485,-33.486121535 a20.4,20.4 0 0 1 36.7205047215,-8.067213252 a13.8125,13.8125 0 0 1 14.381267130000001,8.403334786999999 a17.0,17.0 0 0 1 -5.3082483,33.15 h -3.4" /><path stroke="#66a1ba" fille="none" stroke-dasharray="3.5 7.5" stroke-width="2" d="M-6.800000000000001,18.5 l-18.7,-25.5 m7.5,0 l18.7,25.5 m7.5,0 l-18.7,-25.5 m7.5,0 l18.7,25.5 m7.5,0 l-18.7,-25.5 " /><path stroke="none" fill="#000000" d="M-9.42235138,48 l8.54455967,-4.047423 a6.04100450,6.04100450 0 0 0 2.54603347,-8.64621208 l-3.23725145,-5.21347156 a2.74580363,2.74580363 0 0 1 0.78256116,-3.71485342 l4.93895246,-3.37803994 h-1.38888889 l-5.10795449,2.93585208 a4.68254091,4.68254091 0 0 0 -2.09563466,5.5796135 l2.27226862,6.62156404 a3.29583971,3.29583971 0 0 1 -1.84474537,4.10998876 l-13.74323385,5.75298161 z m33.33333333,0 l1.22771241,-1.22771241 a6.20359314,6.20359314 0 0 0 -1.28480621,-9.75907203 l-13.55967183,-7.82868018 a3.22628070,3.22628070 0 0 1 -1.41857181,-3.89749403 l0.83241498,-2.28704135 h-1.38888889 l-0.68119443,1.08342259 a4.68254091,4.68254091 0 0 0 1.30173924,6.30605466 l12.49300857,8.59055233 a2.68888799,2.68888799 0 0 1 0.13365758,4.33313596 l-5.98873292,4.68683446 z" /><path stroke="#66a1ba" stroke-width="1.2" stroke-linecap="round" fill="none" d="M -17,26 l0.0,16.0 m-6.92820323,-12.0 l13.85640646,8.0 m-13.85640646,-0.0 l13.85640646,-8.0 m-6.92820323,-4.0 m2.30940108,1.33333333 l-2.30940108,1.33333333 l-2.30940108,-1.33333333 m2.30940108,-1.33333333 m-6.92820323,4.0 m2.30940108,-1.33333333 l-0.0,2.66666667 l-2.30940108,1.33333333 m0.0,-2.66666667 m-0.0,8.0 m0.0,-2.66666667 l2.30940108,1.33333333 l0.0,2.66666667 m-2.30940108,-1.33333333 m6.92820323,4.0 m-2.30940108,-1.33333333 l2.30940108,-1.33333333 l2.30940108,1.33333333 m-2.30940108,1.33333333 m6.92820323,-4.0 m-2.30940108,1.33333333 l0.0,-2.66666667 l2.30940108,-1.33333333 m-0.0,2.66666667 m0.0,-8.0 m-0.0,2.66666667 l-2.30940108,-1.33333333 l-0.0,-2.66666667 m2.30940108,1.33333333 " />'
 SVG_ICON_LIGHTNING = '<path stroke="#828487" fill="none" d="M -31,22 m 12,0 h -12 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -12" /><path stroke-width="2" stroke-linejoin="round" stroke="#f6bc68" fill="#f6bc68" d="M-2,45 l9.12538211,-21.49805304 l-12.39550268,3.32136493 l7.14107222,-16.82331189 h-8.81753557 l-4.1787982,21.49805304 l12.39550268,-3.32136493 z" />'
+SVG_ICON_THUNDERSTORM = _SVG_CLOUD + _SVG_BOLT + _SVG_RAIN_STRIPES
+SVG_ICON_THUNDERSTORM_HAIL = _SVG_CLOUD + _SVG_BOLT + _SVG_HAILSTONES
 SVG_ICON_SUNMOON = '<g stroke="#f6bc68"><circle cx="-20" cy="-5" r="18" fill="none" /><path d="M 4.0,-5.0 L 18.0,-5.0 M -3.02943725152286,11.97056274847714 L 6.87005768508881,21.8700576850888 M -20.0,19.0 L -20.0,33.0 M -36.97056274847714,11.97056274847714 L -46.8700576850888,21.87005768508881 M -44.0,-5.0 L -58.0,-5.0 M -36.97056274847714,-21.97056274847714 L -46.87005768508881,-31.8700576850888 M -20.0,-29.0 L -20.00000000000001,-43.0 M -3.02943725152286,-21.97056274847714 L 6.8700576850888,-31.87005768508881 " /></g><path stroke="#da4935" fill="none" d="M 35,-5 a 26,26 0 0 1 -22,39 a 24,24 0 1 0 22,-39 z" />'
 SVG_ICON_N = [
     ('<g stroke="#f6bc68"><circle cx="0" cy="0" r="18" fill="none" /><path d="M 24.0,0.0 L 38.0,0.0 M 16.97056274847714,16.97056274847714 L 26.87005768508881,26.8700576850888 M 0.0,24.0 L 0.0,38.0 M -16.97056274847714,16.97056274847714 L -26.8700576850888,26.87005768508881 M -24.0,0.0 L -38.0,0.0 M -16.97056274847714,-16.97056274847714 L -26.87005768508881,-26.8700576850888 M -0.0,-24.0 L -1e-14,-38.0 M 16.97056274847714,-16.97056274847714 L 26.8700576850888,-26.87005768508881 " /></g>',
@@ -235,21 +256,136 @@ SVG_ICON_TORNADO = """<svg %s
 </svg>
 """
 
+# minify the SVG fragments; set to False for debugging the icons
+_MINIFY_SVG = True
+
+def _minify_svg(svg):
+    """ reduce the size of an SVG fragment
+
+        Collapses whitespace runs and truncates path coordinates to
+        two decimals, which no renderer can distinguish visually at
+        icon sizes. The minified icons make the rendered HTML pages
+        considerably smaller.
+    """
+    svg = re.sub(r'\s+',' ',svg)
+    svg = re.sub(r'(\d+\.\d{2})\d+',r'\1',svg)
+    # 22.0 --> 22, 1.50 --> 1.5
+    svg = re.sub(r'\d+\.\d+',lambda m:m.group().rstrip('0').rstrip('.'),svg)
+    return svg
+
+_DESC_RE = re.compile(r'<desc\b.*?</desc>',re.S)
+
+# flyweight pool: some symbols differ in their <desc> only and become
+# byte-identical after stripping; they then share one string object
+_SVG_POOL = dict()
+
+def _strip_svg(sym):
+    """ minify a complete SVG document, dropping the <desc> block
+
+        The descriptions stay in the source as documentation but are
+        never rendered, so they need not travel with every symbol
+        embedded in a page.
+    """
+    if not sym or not _MINIFY_SVG: return sym
+    sym = _minify_svg(_DESC_RE.sub('',sym)).replace('> <','><').strip()
+    return _SVG_POOL.setdefault(sym,sym)
+
+if _MINIFY_SVG:
+    SVG_ICON_UNKNOWN = _minify_svg(SVG_ICON_UNKNOWN)
+    SVG_ICON_CLOUDY = _minify_svg(SVG_ICON_CLOUDY)
+    SVG_ICON_CLOUDY_WIND = _minify_svg(SVG_ICON_CLOUDY_WIND)
+    SVG_ICON_FOG = _minify_svg(SVG_ICON_FOG)
+    SVG_ICON_WIND = _minify_svg(SVG_ICON_WIND)
+    SVG_ICON_SANDSTORM = _minify_svg(SVG_ICON_SANDSTORM)
+    SVG_ICON_BLOWINGSNOW = _minify_svg(SVG_ICON_BLOWINGSNOW)
+    SVG_ICON_RAIN = _minify_svg(SVG_ICON_RAIN)
+    SVG_ICON_DRIZZLE = _minify_svg(SVG_ICON_DRIZZLE)
+    SVG_ICON_HAIL = _minify_svg(SVG_ICON_HAIL)
+    SVG_ICON_SLEET = _minify_svg(SVG_ICON_SLEET)
+    SVG_ICON_SNOW = _minify_svg(SVG_ICON_SNOW)
+    SVG_ICON_FREEZINGRAIN = _minify_svg(SVG_ICON_FREEZINGRAIN)
+    SVG_ICON_FREEZINGDRIZZLE = _minify_svg(SVG_ICON_FREEZINGDRIZZLE)
+    SVG_ICON_LIGHTNING = _minify_svg(SVG_ICON_LIGHTNING)
+    SVG_ICON_THUNDERSTORM = _minify_svg(SVG_ICON_THUNDERSTORM)
+    SVG_ICON_THUNDERSTORM_HAIL = _minify_svg(SVG_ICON_THUNDERSTORM_HAIL)
+    SVG_ICON_SUNMOON = _minify_svg(SVG_ICON_SUNMOON)
+    SVG_ICON_N = [(_minify_svg(day),_minify_svg(night))
+                                           for day,night in SVG_ICON_N]
+    SVG_ICON_N_WIND = [(_minify_svg(day),_minify_svg(night))
+                                           for day,night in SVG_ICON_N_WIND]
+    SVG_ICON_TORNADO = _minify_svg(SVG_ICON_TORNADO)
+
+# exceptions the SVG rendering functions swallow into an empty string
+_SVG_EXC = (ArithmeticError,LookupError,TypeError,ValueError)
+
+# okta value to SVG_ICON_N / SVG_ICON_N_WIND index
+_OKTA_TO_IDX = bytes((0,1,1,2,2,2,3,3,4,5,6))
+
+def _svg_height(width):
+    """ icon height for a given width, as int if the ratio is exact """
+    # 0.78125 is 100/128, exact in binary, so common widths give
+    # integer heights, which render as '100' instead of '100.0'
+    height = width*0.78125
+    return int(height) if height==int(height) else round(height,5)
+
+# icon heights for the widths skins commonly use
+_HEIGHT_CACHE = {w:_svg_height(w) for w in (16,24,32,48,64,96,128,160,192,256)}
+
+# day and night variants flattened into one tuple each, indexed by
+# idx*2+night with a single subscription
+_SVG_ICON_N_FLAT = tuple(s for pair in SVG_ICON_N for s in pair)
+_SVG_ICON_N_WIND_FLAT = tuple(s for pair in SVG_ICON_N_WIND for s in pair)
+
 def svg_icon_n(okta, night=False, width=128, text=None, x=None, y=None, wind=0):
+    # invalid okta values (especially None for missing data) are
+    # frequent; an explicit check is much cheaper than raising and
+    # catching an exception for each of them
+    if not isinstance(okta,int) or not 0<=okta<=10:
+        return ""
+    if text is None and x is None and y is None:
+        # the common case: a handful of distinct (okta, night, width,
+        # wind) combinations per skin, rendered over and over again
+        return _svg_icon_n_cached(okta, 1 if night else 0, width, wind)
     try:
-        height = round(width * 0.78125,5)
+        height = _HEIGHT_CACHE.get(width) or _svg_height(width)
         night = 1 if night else 0
-        idx = (0,1,1,2,2,2,3,3,4,5,6)[okta]
-        text = ('<title>%s</title><rect x="-64" y="-50" width="100%%" height="100%%" stroke="none" fill="#000000" fill-opacity="0" />' % text) if text else ''
-        coord = ('x="%s" y="%s"' % (x,y)) if x is not None and y is not None else ''
-        icon = SVG_ICON_N_WIND if wind else SVG_ICON_N
-        return ((SVG_ICON_START % (coord,width,height,text))+
-            icon[idx][night]+
-            SVG_ICON_END)
-    except (ArithmeticError,LookupError,TypeError,ValueError):
+        idx = _OKTA_TO_IDX[okta]
+        text = f'<title>{text}</title><rect x="-64" y="-50" width="100%" height="100%" stroke="none" fill="#000000" fill-opacity="0" />' if text else ''
+        coord = '' if x is None or y is None else f'x="{x}" y="{y}"'
+        icon = _SVG_ICON_N_WIND_FLAT if wind else _SVG_ICON_N_FLAT
+        return ''.join((_svg_start(coord,width,height,text),
+            icon[(idx<<1)|night],
+            SVG_ICON_END))
+    except _SVG_EXC:
         return ""
 
-SVG_ICON_WW = [
+def svg_icon_n_batch(oktas, nights=None, width=128, wind=0):
+    """ render cloud cover icons for a whole forecast table at once
+
+        `oktas` is a sequence of okta values, `nights` an optional
+        sequence of the same length. Repeated (okta, night)
+        combinations come out of the icon cache, so a long table
+        costs little more than its few distinct icons.
+    """
+    if nights is None:
+        return [svg_icon_n(okta,False,width,wind=wind) for okta in oktas]
+    return [svg_icon_n(okta,night,width,wind=wind)
+                                   for okta,night in zip(oktas,nights)]
+
+@functools.lru_cache(maxsize=128)
+def _svg_icon_n_cached(okta, night, width, wind):
+    """ svg_icon_n() without text and coordinates """
+    try:
+        height = _HEIGHT_CACHE.get(width) or _svg_height(width)
+        idx = _OKTA_TO_IDX[okta]
+        icon = _SVG_ICON_N_WIND_FLAT if wind else _SVG_ICON_N_FLAT
+        return ''.join((_svg_start('',width,height,''),
+            icon[(idx<<1)|night],
+            SVG_ICON_END))
+    except _SVG_EXC:
+        return ""
+
+SVG_ICON_WW = (
     # 00
     None,
     # 01
@@ -441,15 +577,15 @@ SVG_ICON_WW = [
     # 94
     SVG_ICON_SNOW,
     # 95
-    '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke-width="2" stroke-linejoin="round" stroke="#f6bc68" fill="#f6bc68" d="M-4,6 l9.12538211,-21.49805304 l-12.39550268,3.32136493 l7.14107222,-16.82331189 h-8.81753557 l-4.1787982,21.49805304 l12.39550268,-3.32136493 z" /><path stroke="none" fill="#66a1ba" d="M -28,10 h 5 l 22.0,30 h -5 l -22.0,-30 z m 15,0 h 5 l 22.0,30 h -5 l -22.0,-30 z m 15,0 h 5 l 22.0,30 h -5 l -22.0,-30 z " />',
+    SVG_ICON_THUNDERSTORM,
     # 96
-    '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke-width="2" stroke-linejoin="round" stroke="#f6bc68" fill="#f6bc68" d="M-4,6 l9.12538211,-21.49805304 l-12.39550268,3.32136493 l7.14107222,-16.82331189 h-8.81753557 l-4.1787982,21.49805304 l12.39550268,-3.32136493 z" /><g stroke="none" fill="#66a1ba"><circle cx="-15" cy="37" r="4" /><circle cx="-6" cy="19" r="4" /><circle cx="11" cy="30" r="4" /></g>',
+    SVG_ICON_THUNDERSTORM_HAIL,
     # 97
-    '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke-width="2" stroke-linejoin="round" stroke="#f6bc68" fill="#f6bc68" d="M-4,6 l9.12538211,-21.49805304 l-12.39550268,3.32136493 l7.14107222,-16.82331189 h-8.81753557 l-4.1787982,21.49805304 l12.39550268,-3.32136493 z" /><path stroke="none" fill="#66a1ba" d="M -28,10 h 5 l 22.0,30 h -5 l -22.0,-30 z m 15,0 h 5 l 22.0,30 h -5 l -22.0,-30 z m 15,0 h 5 l 22.0,30 h -5 l -22.0,-30 z " />',
+    SVG_ICON_THUNDERSTORM,
     # 98
     SVG_ICON_LIGHTNING,
     # 99
-    '<path stroke="#828487" fill="none" d="M -31,22 m 4,0 h -4 a 20,20 0 1 1 4.88026841,-39.3954371 a 24,24 0 0 1 43.20059379,-9.49083912 a 16.25,16.25 0 0 1 16.9191378,9.88627622 a 20,20 0 0 1 -6.244998,39h -4" /><path stroke-width="2" stroke-linejoin="round" stroke="#f6bc68" fill="#f6bc68" d="M-4,6 l9.12538211,-21.49805304 l-12.39550268,3.32136493 l7.14107222,-16.82331189 h-8.81753557 l-4.1787982,21.49805304 l12.39550268,-3.32136493 z" /><g stroke="none" fill="#66a1ba"><circle cx="-15" cy="37" r="4" /><circle cx="-6" cy="19" r="4" /><circle cx="11" cy="30" r="4" /></g>',
+    SVG_ICON_THUNDERSTORM_HAIL,
     # 100
     None,
     # 101
@@ -630,16 +766,45 @@ SVG_ICON_WW = [
     None,
     # 189
     SVG_ICON_HAIL,
-]
+)
+
+# drop the None placeholders: a dict keyed by ww code stores only the
+# codes that have an icon and turns the presence check into a hash
+# lookup; the commented literal above stays the readable reference
+def _init_svg_icon_ww(icons):
+    # the named constants are minified already; this catches the
+    # icons spelled out inline in the table above, keeping one string
+    # object per distinct icon
+    dedup = dict()
+    table = dict()
+    for ww,icon in enumerate(icons):
+        if icon is None: continue
+        minified = dedup.get(icon)
+        if minified is None:
+            minified = _minify_svg(icon) if _MINIFY_SVG else icon
+            dedup[icon] = minified
+        table[ww] = minified
+    return table
+
+SVG_ICON_WW = _init_svg_icon_ww(SVG_ICON_WW)
 
 def svg_icon_ww(ww, width=128, text=None, x=None, y=None):
+    # invalid ww values (especially None for missing data) are
+    # frequent; an explicit check is much cheaper than raising and
+    # catching an exception for each of them
+    if not isinstance(ww,int) or not 0<=ww<=199:
+        return ""
+    if text is None and x is None and y is None:
+        # the common case: the same few (ww, width) combinations,
+        # rendered once and served from the cache afterwards
+        return _svg_icon_ww_cached(ww, width)
     try:
-        height = round(width * 0.78125,5)
-        coord = ('x="%s" y="%s"' % (x,y)) if x is not None and y is not None else ''
+        height = _HEIGHT_CACHE.get(width) or _svg_height(width)
+        coord = '' if x is None or y is None else f'x="{x}" y="{y}"'
         if ww==19 or ww==199:
             # Tornado
             return SVG_ICON_TORNADO % (coord,width,height)
-        text = ('<title>%s</title><rect x="-64" y="-50" width="100%%" height="100%%" stroke="none" fill="#000000" fill-opacity="0" />' % text) if text else ''
+        text = f'<title>{text}</title><rect x="-64" y="-50" width="100%" height="100%" stroke="none" fill="#000000" fill-opacity="0" />' if text else ''
         # According to the BUFR specification codes below 100 are
         # ww (table 4677) codes. With codes from 100 to 199 the
         # last 2 digits are wawa (table 4680) codes.
@@ -648,12 +813,53 @@ def svg_icon_ww(ww, width=128, text=None, x=None, y=None):
                 ww = 17
             elif ww>=191 and ww<=196:
                 ww = 95
-        return ((SVG_ICON_START % (coord,width,height,text))+
-            SVG_ICON_WW[ww]+
-            SVG_ICON_END)
-    except (ArithmeticError,LookupError,TypeError,ValueError):
+        icon = SVG_ICON_WW.get(ww)
+        if icon is None:
+            return ""
+        return ''.join((_svg_start(coord,width,height,text),
+            icon,
+            SVG_ICON_END))
+    except _SVG_EXC:
         return ""
 
+@functools.lru_cache(maxsize=256)
+def _svg_icon_ww_cached(ww, width):
+    """ svg_icon_ww() without text and coordinates """
+    try:
+        height = _HEIGHT_CACHE.get(width) or _svg_height(width)
+        if ww==19 or ww==199:
+            # Tornado
+            return SVG_ICON_TORNADO % ('',width,height)
+        # According to the BUFR specification codes below 100 are
+        # ww (table 4677) codes. With codes from 100 to 199 the
+        # last 2 digits are wawa (table 4680) codes.
+        if ww>=100:
+            if ww==190:
+                ww = 17
+            elif ww>=191 and ww<=196:
+                ww = 95
+        icon = SVG_ICON_WW.get(ww)
+        if icon is None:
+            return ""
+        return ''.join((_svg_start('',width,height,''),
+            icon,
+            SVG_ICON_END))
+    except _SVG_EXC:
+        return ""
+
+@functools.lru_cache(maxsize=64)
+def svg_icon_ww_gz(ww, width=128):
+    """ gzip compressed WMO symbol
+
+        for web server setups that serve precompressed bodies, for
+        example nginx with gzip_static; compressed once per (ww,
+        width) and cached
+    """
+    icon = svg_icon_ww(ww,width)
+    if not icon:
+        return b''
+    return gzip.compress(icon.encode('utf-8'),9)
+
 
 
 
@@ -661,6 +867,9 @@ def svg_icon_ww(ww, width=128, text=None, x=None, y=None):
 
 # The list is sorted by severity.
 # ww, german description, English description, severity, Belchertown icon, DWD icon, Aeris icon, Aeris coded weather, E.Flower icon
+WwInfo = collections.namedtuple('WwInfo','ww de en severity belchertown dwd aeris aeris_code wi svg')
+# return type of get_ww(): a WwInfo row with the SVG markup appended
+WwCode = collections.namedtuple('WwCode',WwInfo._fields+('symbol',))
 WW_LIST = [
     # ::FC ::TO
     (19,'Tornado (Windhose), Trichterwolke','funnel clouds (tornado)',None,'tornado.png','18.png','','::FC','wi-tornado','tornado.png'),
@@ -812,6 +1021,22 @@ WW_LIST = [
     (0,'keine Bewölkungsentwicklung','no cloud cover development',29,None,None,None,None,None,None)
 ]
 
+# named fields for the call sites; WwInfo is a tuple subclass, so
+# indexing and concatenation keep working unchanged
+WW_LIST = [WwInfo(*ii) for ii in WW_LIST]
+
+# index of WW_LIST by ww code for O(1) metadata lookup; WW_LIST itself
+# remains the severity-ordered iteration order. As WW_LIST covers every
+# code 0...99 exactly once, a flat tuple indexed by code serves as the
+# index without hashing.
+WW_BY_CODE = [None]*100
+for t in WW_LIST:
+    WW_BY_CODE[t[0]] = t
+WW_BY_CODE = tuple(WW_BY_CODE)
+
+# rank of each code in the severity ordering of WW_LIST
+_WW_RANK = {t.ww:i for i,t in enumerate(WW_LIST)}
+
 N_ICON_LIST = [
     # Belchertown day, night, DWD, Aeris coded weather, Aeris, E. Flowers day, night
     # 0...7%     0/8
@@ -841,7 +1066,25 @@ WW_SECTIONS = {
     91:('Gewitter während der letzten Stunde, jetzt nur noch Niederschläge','thunderstorm during the preceding hour but not at the time of observation'),
     95:('Gewitter jetzt','thunderstorm at the time of observation')
 }
+
+# parallel sorted arrays over WW_SECTIONS for binary search
+_WW_SECTION_KEYS = sorted(WW_SECTIONS)
+_WW_SECTION_VALS = tuple(WW_SECTIONS[k] for k in _WW_SECTION_KEYS)
+
+def ww_section(ww):
+    """ get the section of WMO table 4677 a ww code belongs to
+
+        Args:
+            ww (int): present weather code
+
+        Returns:
+            tuple: german and English section heading
+    """
+    return _WW_SECTION_VALS[bisect.bisect_right(_WW_SECTION_KEYS,ww)-1]
+
 WW_XML = '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">\n'
+# pre-encoded for writing SVG files in binary mode
+WW_XML_BYTES = WW_XML.encode('utf-8')
 WW_SYMBOLS = [
     # 00 https://upload.wikimedia.org/wikipedia/commons/a/ab/Symbol_code_ww_00.svg
     '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="50" height="50" viewBox="-25 -25 50 50"> <desc id="en"> 	Codes 00-09 General Group: No precipitation, fog, duststorm, sandstorm, drifting or blowing snow at the station at the time of observation or, except for 09 during the preceeding hour. 	Code: 00 	Description: Cloud development NOT observed or NOT observable during past hour (not plotted) </desc> <g id="ww_00" fill="none" stroke-width="3" stroke="currentColor" > 	<circle r="17"/> </g> </svg> ',
@@ -1047,6 +1290,77 @@ WW_SYMBOLS = [
     '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="50" height="50" viewBox="-25 -25 50 50"> <desc id="en"> 	Codes 80-99 General Group: Showery precipitation, or precipitation with current or recent thunderstorm. 	Code: 99 	Description: Thunderstorm, heavy, with hail at time of observation </desc> <g id="ww_99"> 	<path d="M -4,-14 h 8 l -4,-6.93 z" style="fill:none; stroke-width:2.5; stroke:#000000" /> 	<path d="M -10.5,-8 h 20 l-7.5,14.5 l 6.5,6.5 l-6.5,6.5" style="fill:none; stroke-width:3; stroke:#ed1c24" /> 	<path d="M -6.5,-8 v 31.5" style="fill:none; stroke-width:3; stroke:#ed1c24" /> 	<path d="M 2,20.5 h-1 v-1 z" style="fill:#ed1c24; stroke-width:3; stroke:#ed1c24" /> </g> </svg> '
 ]
 
+# a tuple subscribes without hashing and cannot be reordered by
+# accident; the index is the ww code
+WW_SYMBOLS = tuple(_strip_svg(sym) for sym in WW_SYMBOLS)
+
+# sprite sheet over WW_SYMBOLS; built on first use only
+WW_SPRITE = None
+
+def ww_symbol_sprite():
+    """ all ww symbols as one hidden SVG sprite sheet
+
+        Pages that show many symbols can include the sprite once and
+        reference the individual symbols with ww_symbol_ref(), which
+        costs a few dozen bytes per use instead of the full symbol.
+    """
+    global WW_SPRITE
+    if WW_SPRITE is None:
+        syms = []
+        for ww,sym in enumerate(WW_SYMBOLS):
+            sym = re.sub(r'^<svg[^>]*>',
+                '<symbol id="wmo4677_ww%02d" viewBox="-25 -25 50 50">' % ww,
+                sym[:sym.rfind('</svg>')])
+            syms.append(sym+'</symbol>')
+        WW_SPRITE = ('<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" style="display:none">'
+                     + ''.join(syms) + '</svg>')
+    return WW_SPRITE
+
+def ww_symbol_ref(ww, width=50):
+    """ reference to a symbol of the sprite sheet
+
+        Args:
+            ww (int): present weather code
+            width (int): width and height of the icon
+
+        Returns:
+            str: SVG fragment referencing the sprite sheet entry
+    """
+    return f'<svg width="{width}" height="{width}" viewBox="-25 -25 50 50"><use href="#wmo4677_ww{ww:02d}"/></svg>'
+
+@functools.lru_cache(maxsize=None)
+def ww_symbol_gz(ww):
+    """ gzip compressed symbol of WMO table 4677
+
+        for web server setups that serve precompressed bodies, for
+        example nginx with gzip_static; compressed once per code and
+        cached
+    """
+    try:
+        sym = WW_SYMBOLS[ww]
+    except _SVG_EXC:
+        return b''
+    return gzip.compress(sym.encode('utf-8'),9)
+
+@functools.lru_cache(maxsize=128)
+def ww_png(ww, size=50):
+    """ symbol of WMO table 4677 rasterized to PNG
+
+        for skins that embed icons as data URIs for older mail
+        clients; rendered once per (code, size) and cached for the
+        lifetime of the process
+
+        requires the cairosvg package
+    """
+    import cairosvg
+    try:
+        sym = WW_SYMBOLS[ww]
+    except _SVG_EXC:
+        return b''
+    return cairosvg.svg2png(bytestring=sym.encode('utf-8'),
+                            output_width=size,
+                            output_height=size)
+
 WAWA_SYMBOLS = [
     # 00 No significant weather observed
     '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="50" height="50" viewBox="-25 -25 50 50"> </svg>',
@@ -1279,6 +1593,11 @@ OKTA_SYMBOLS = [
     '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="50" height="50" viewBox="0 0 100 100"> <desc>WMO 2700 N no data</desc> <circle cx="50" cy="50" r="45" stroke-width="8" stroke="currentColor" fill="none" /> <line x1="5" y1="50" x2="95" y2="50" stroke-width="8" stroke="currentColor" /> <line x1="50" y1="5" x2="50" y2="95" stroke-width="8" stroke="currentColor" /> </svg>'
 ]
 
+WAWA_SYMBOLS = tuple(_strip_svg(sym) for sym in WAWA_SYMBOLS)
+W_SYMBOLS = tuple(_strip_svg(sym) for sym in W_SYMBOLS)
+WA_SYMBOLS = tuple(_strip_svg(sym) for sym in WA_SYMBOLS)
+OKTA_SYMBOLS = tuple(_strip_svg(sym) for sym in OKTA_SYMBOLS)
+
 OKTA_TEXTS = {
     'de':[
         ('wolkenlos','klar'),        # 0/8
@@ -1363,9 +1682,7 @@ def _gen_wawa_list():
         if i in _WAWA:
             yield (i,)+_WAWA[i]
         elif i in _WAWA_WW:
-            j = _WAWA_WW[i]
-            for k in WW_LIST:
-                if j==k[0]: break
+            k = WW_BY_CODE[_WAWA_WW[i]]
             yield (i,)+k[1:]
         else:
             yield (i,'reserviert','reserved')+(None,)*7
@@ -1374,17 +1691,17 @@ WAWA_LIST = [i for i in _gen_wawa_list()]
 
 
 def get_ww(ww,n,night):
-    """ get icon and description for the current weather 
-    
+    """ get icon and description for the current weather
+
         Args:
             ww (iterable)   : list of present weather codes
                               The most important one is used.
             n (int)         : cloud cover percentage
             night (boolean) : use night icon
-        
+
         Returns:
             tuple: icons and description of the current weather
-        
+
         Return tuple:
         [0]: ww
         [1]: german description
@@ -1398,20 +1715,35 @@ def get_ww(ww,n,night):
         [9]: SVG icon filename
         [10]: SVG icon
     """
+    try:
+        return _get_ww_cached(tuple(ww) if ww is not None else (),n,1 if night else 0)
+    except TypeError:
+        # unhashable argument: compute without the cache
+        return _get_ww_cached.__wrapped__(tuple(ww) if ww is not None else (),n,1 if night else 0)
+
+@functools.lru_cache(maxsize=512)
+def _get_ww_cached(ww,n,night):
+    """ get_ww() body, cached
+
+        A report cycle asks for the same few (ww,n,night) combinations
+        over and over again. The result tuple is immutable, so it can
+        be shared between callers.
+    """
     # If weather code ww is within the list of WW_LIST (which means
     # it is important over cloud coverage), get the data from that
-    # list.
-    for ii in WW_LIST:
-        if ii[0] in ww:
-            wwcode = ii+(WW_SYMBOLS[ii[0]],)
-            break
+    # list. Instead of scanning the whole severity-ordered list for
+    # each reported code, probe the codes against the precomputed
+    # rank table and take the highest-ranking one.
+    cand = [_WW_RANK[c] for c in ww if c in _WW_RANK]
+    if cand:
+        ii = WW_LIST[min(cand)]
+        wwcode = WwCode(*ii,symbol=WW_SYMBOLS[ii.ww])
     else:
-        wwcode = (0,'','',30,'unknown.png','unknown.png','na.png','','wi_na','unknown.svg',WW_SYMBOLS[0])
+        wwcode = WwCode(0,'','',30,'unknown.png','unknown.png','na.png','','wi_na','unknown.svg',WW_SYMBOLS[0])
     # Otherwise use cloud coverage
     # see aerisweather for percentage values
     # https://www.aerisweather.com/support/docs/api/reference/weather-codes/
-    if wwcode[0] in (0,1,2,3,14,15,16,18,20,21,22,23,25,26,27,28,29,40):
-        night = 1 if night else 0
+    if wwcode.ww in (0,1,2,3,14,15,16,18,20,21,22,23,25,26,27,28,29,40):
         cover = get_cloudcover(n)
         if cover is not None:
             # Belchertown icons
@@ -1420,24 +1752,20 @@ def get_ww(ww,n,night):
             aeicon = cover[4]
             aecode = '::'+cover[3]
             # DWD icons
-            if n<12.5:
-                dwd = N_ICON_LIST[0][2]
-            elif n<50:
-                dwd = N_ICON_LIST[1][2]
-            elif n<87.5:
-                dwd = N_ICON_LIST[2][2]
+            dwd = N_ICON_LIST[(0,1,2,4)[bisect.bisect_right(_DWD_N_BREAKPOINTS,n)]][2]
+            if isinstance(n,(int,float)):
+                n_str = '%.0f%%' % n
             else:
-                dwd = N_ICON_LIST[4][2]
-            try:
-                n_str = '%.0f%%' % float(n)
-            except Exception:
-                n_str = str(n)
+                try:
+                    n_str = '%.0f%%' % float(n)
+                except Exception:
+                    n_str = str(n)
             wi = cover[night+5]
-            if wwcode[0]==18:
+            if wwcode.ww==18:
                 svgiconfn = icon.replace('.png','-wind.svg')
             else:
                 svgiconfn = icon.replace('.png','.svg')
-            wwcode = (wwcode[0],wwcode[1]+' '+n_str,wwcode[2]+' '+str(n),wwcode[3],icon,dwd,aeicon,aecode,wi,svgiconfn,WW_SYMBOLS[wwcode[0]])
+            wwcode = wwcode._replace(de=f'{wwcode.de} {n_str}',en=f'{wwcode.en} {n}',belchertown=icon,dwd=dwd,aeris=aeicon,aeris_code=aecode,wi=wi,svg=svgiconfn)
     return wwcode
 
 def get_cloudcover(n):
@@ -1450,21 +1778,16 @@ def get_cloudcover(n):
             tuple: set of icons
     """
     if n is None: return None
-    if n<7:
-        icon = N_ICON_LIST[0]
-    elif n<32:
-        icon = N_ICON_LIST[1]
-    elif n<70:
-        icon = N_ICON_LIST[2]
-    elif n<95:
-        icon = N_ICON_LIST[3]
-    elif n<106.25:
-        icon = N_ICON_LIST[4]
-    elif n<118.75:
-        icon = ('fog.png','fog.png','40.png','::BR','fog','wi-fog','wi-fog')
-    else:
-        icon = ('unknown.png','unknown.png','','::','na','wi-na','wi-na')
-    return icon
+    return _CLOUDCOVER_ICONS[bisect.bisect_right(_CLOUDCOVER_BREAKPOINTS,n)]
+
+# cloud cover thresholds and the icon rows they select, searched with
+# bisect instead of a compare ladder; the two rows past 100% stand
+# for fog and invalid readings
+_CLOUDCOVER_BREAKPOINTS = (7,32,70,95,106.25,118.75)
+_CLOUDCOVER_ICONS = tuple(N_ICON_LIST[:5]) + (
+    ('fog.png','fog.png','40.png','::BR','fog','wi-fog','wi-fog'),
+    ('unknown.png','unknown.png','','::','na','wi-na','wi-na'))
+_DWD_N_BREAKPOINTS = (12.5,50,87.5)
 
 def visibility_code(visibility):
     """ visibility code according to WMO table 4377 
@@ -1480,12 +1803,13 @@ def visibility_code(visibility):
         return '%02d' % vv
     if vv<=55:
         return '50'
-    vv = round(visibility,0)
+    # codes 56 to 80: whole kilometers, codes 81 to 88: steps of 5 km
+    vv = int(round(visibility*0.001,0))
     if vv<=30:
-        return '%02d' % vv+50
-    vv = round(visibility/5 ,0)
+        return '%02d' % (vv+50)
+    vv = int(round(visibility*0.0002,0))
     if vv<=14:
-        return '%02d' % vv+74
+        return '%02d' % (vv+74)
     return '89'
 
 def pressure_tendency(p_list):
@@ -1645,6 +1969,7 @@ def print_ww_list(image_path='.'):
         Returns:
             str: table in HTML
     """
+    import copy
     x = copy.copy(WW_LIST)
     x.sort(key=lambda x:x[0])
     s = '<table>\n'
@@ -1776,7 +2101,7 @@ def print_ww_icon_tab(image_path='.', color=None):
     s += '</tr>\n'
     for ww in range(100):
         if ww==0:
-            sym = (SVG_ICON_START % ('',50,39,''))+ SVG_ICON_SUNMOON + SVG_ICON_END
+            sym = _svg_start('',50,39,'') + SVG_ICON_SUNMOON + SVG_ICON_END
         else:
             sym = svg_icon_ww(ww,width=50)
         if (ww%10)==0:
@@ -1790,43 +2115,43 @@ def print_ww_icon_tab(image_path='.', color=None):
 def write_svg_files_ww(image_path='.'):
     for ww,sym in enumerate(WW_SYMBOLS):
         fn = os.path.join(image_path,'wmo4677_ww%02d.svg' % ww)
-        with open(fn,'w') as file:
-            file.write(WW_XML)
-            file.write(sym)
+        with open(fn,'wb') as file:
+            file.write(WW_XML_BYTES)
+            file.write(sym.encode('utf-8'))
 
 def write_svg_files_wawa(image_path='.'):
     for wawa,sym in enumerate(WAWA_SYMBOLS):
         fn = os.path.join(image_path,'wmo4680_wawa%02d.svg' % wawa)
         if sym:
-            with open(fn,'w') as file:
-                file.write(WW_XML)
-                file.write(sym)
+            with open(fn,'wb') as file:
+                file.write(WW_XML_BYTES)
+                file.write(sym.encode('utf-8'))
 
 def write_svg_files_W(image_path='.'):
     for w,sym in enumerate(W_SYMBOLS):
         fn = os.path.join(image_path,'wmo4561_W%01d.svg' % w)
         if sym:
-            with open(fn,'w') as file:
-                file.write(WW_XML)
-                file.write(sym)
+            with open(fn,'wb') as file:
+                file.write(WW_XML_BYTES)
+                file.write(sym.encode('utf-8'))
 
 def write_svg_files_n(image_path='.'):
     for n,sym in enumerate(OKTA_SYMBOLS):
         fn = os.path.join(image_path,'wmo2700_n%02d.svg' % n)
         if sym:
-            with open(fn,'w') as file:
-                file.write(WW_XML)
-                file.write(sym)
+            with open(fn,'wb') as file:
+                file.write(WW_XML_BYTES)
+                file.write(sym.encode('utf-8'))
 
 def write_svg_files_a(image_path='.'):
     for a in range(9):
         fn = os.path.join(image_path,'wmo0200_a%01d.svg' % a)
-        with open(fn,'w') as file:
-            file.write(WW_XML+'\n')
-            file.write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="50" height="50" viewBox="-25 -25 50 50">\n')
-            file.write('<desc>WMO 0200 a %01d</desc>\n' % a)
-            file.write(pressure_tendency_svg_path(0,0,50,a)+'\n')
-            file.write('</svg>\n')
+        with open(fn,'wb') as file:
+            file.write(WW_XML_BYTES+b'\n')
+            file.write(b'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="50" height="50" viewBox="-25 -25 50 50">\n')
+            file.write(b'<desc>WMO 0200 a %01d</desc>\n' % a)
+            file.write(pressure_tendency_svg_path(0,0,50,a).encode('utf-8')+b'\n')
+            file.write(b'</svg>\n')
 
 if hasSearchList:
 
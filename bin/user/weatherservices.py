@@ -166,9 +166,12 @@ import io
 import zipfile
 import time
 import datetime
+import calendar
 import json
 import random
 import math
+import functools
+import bisect
 import traceback
 import os.path
 
@@ -255,6 +258,12 @@ try:
 except ImportError:
     has_db = False
 
+try:
+    import pandas
+    has_pandas = True
+except ImportError:
+    has_pandas = False
+
 for group in weewx.units.std_groups:
     weewx.units.std_groups[group].setdefault('group_coordinate','degree_compass')
 
@@ -309,19 +318,13 @@ N_ICON_LIST = [
     ('mostly-cloudy-day.png','mostly-cloudy-night.png','5-8.png','BK','mcloudy'),
     ('cloudy.png','cloudy.png','8-8.png','OV','cloudy')]
     
+# cloud cover percentage breakpoints between the N_ICON_LIST entries
+CLOUDCOVER_BREAKPOINTS = (7,32,70,95)
+
+@functools.lru_cache(maxsize=128)
 def get_cloudcover(n):
     """ get icon for cloud cover percentage """
-    if n<7:
-        icon = N_ICON_LIST[0]
-    elif n<32:
-        icon = N_ICON_LIST[1]
-    elif n<70:
-        icon = N_ICON_LIST[2]
-    elif n<95:
-        icon = N_ICON_LIST[3]
-    else:
-        icon = N_ICON_LIST[4]
-    return icon
+    return N_ICON_LIST[bisect.bisect_right(CLOUDCOVER_BREAKPOINTS,n)]
 
 
 class DWDXType(weewx.xtypes.XType):
@@ -494,7 +497,10 @@ class DWDPOIthread(BaseThread):
         'h':'hour',
         'min':'minute',
         '%':'percent'}
-    
+
+    # invariant value tuple, shared between all records
+    INTERVAL_VT = (60,'minute','group_interval')
+
     WEATHER = (
         ('unbekannt','unknown.png','unknown.png'), # 0
         ('wolkenlos','clear-day.png','0-8.png'), # 1
@@ -535,40 +541,53 @@ class DWDPOIthread(BaseThread):
         super(DWDPOIthread,self).__init__(name='DWD-POI-'+name, log_success=log_success, log_failure=log_failure)
         self.location = location
         self.iconset = weeutil.weeutil.to_int(iconset)
-        
-        self.lock = threading.Lock()
-        
+
+        # self.data is replaced by a single reference assignment only,
+        # which is atomic under the GIL, so no lock is required between
+        # the thread and the consumer
         self.data = []
         self.last_get_ts = 0
+
+        # one session for the lifetime of the thread to re-use the
+        # connection to the DWD server across polls; all requests go
+        # to the same host, so one pooled connection with retries is
+        # enough
+        self.session = requests.Session()
+        self.session.mount('https://',requests.adapters.HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
+            max_retries=requests.adapters.Retry(total=3,backoff_factor=0.5)))
+        # remember ETag and Last-Modified for conditional requests
+        self.wget_cache = dict()
         
         weewx.units.obs_group_dict.setdefault(prefix+'DateTime','group_time')
-        for key in DWDPOIthread.OBS:
-            obstype = DWDPOIthread.OBS[key]
-            if obstype=='visibility':
-                obsgroup = 'group_distance'
-            else:
-                obsgroup = weewx.units.obs_group_dict.get(obstype)
-            if obsgroup:
-                weewx.units.obs_group_dict.setdefault(prefix+obstype[0].upper()+obstype[1:],obsgroup)
+        for suffix,obsgroup in _POI_OBS_GROUPS:
+            weewx.units.obs_group_dict.setdefault(prefix+suffix,obsgroup)
+
+
+    def shutDown(self):
+        """ request thread shutdown """
+        super(DWDPOIthread,self).shutDown()
+        try:
+            self.session.close()
+        except Exception:
+            pass
 
 
     def get_data(self, ts):
         """ get buffered data """
+        # atomic snapshot of the reference; the list itself is never
+        # modified in place after publication
+        data = self.data
+        """
         try:
-            self.lock.acquire()
-            """
-            try:
-                last_ts = self.data[-1]['time']
-                interval = last_ts - self.last_get_ts
-                self.last_get_ts = last_ts
-            except (LookupError,TypeError,ValueError,ArithmeticError):
-                interval = None
-            """
-            interval = 1
-            data = self.data
-            #print('POI',data)
-        finally:
-            self.lock.release()
+            last_ts = data[-1]['time']
+            interval = last_ts - self.last_get_ts
+            self.last_get_ts = last_ts
+        except (LookupError,TypeError,ValueError,ArithmeticError):
+            interval = None
+        """
+        interval = 1
         #loginf("get_data interval %s data %s" % (interval,data))
         return data,interval
 
@@ -589,10 +608,14 @@ class DWDPOIthread(BaseThread):
         
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_ww(present_weather, night):
-        """ get weather description from value of 'present_weather' 
-        
+        """ get weather description from value of 'present_weather'
+
             ww is not required, so it is None.
+
+            The input domain is small, so the cache turns this into a
+            mere lookup table after the first poll.
             
             returns: (ww,german_text,english_text,severity,belchertown_icon,dwd_icon,aeris_icon)
         """
@@ -615,60 +638,162 @@ class DWDPOIthread(BaseThread):
         try:
             reply = wget(url,
                      log_success=self.log_success,
-                     log_failure=self.log_failure)
+                     log_failure=self.log_failure,
+                     session=self.session,
+                     cache=self.wget_cache)
+            if self.wget_cache.get(url,dict()).get('not_modified'):
+                # HTTP 304: the report did not change since the last
+                # poll, so self.data is still up to date.
+                return
             reply = reply.decode('utf-8')
         except Exception as e:
             logerr("thread '%s': wget %s - %s" % (self.name,e.__class__.__name__,e))
             return
+        if has_pandas:
+            try:
+                x = self.decodecsv_pandas(reply)
+            except Exception as e:
+                logerr("thread '%s': pandas %s - %s" % (self.name,e.__class__.__name__,e))
+                x = self.decodecsv(reply)
+        else:
+            x = self.decodecsv(reply)
+        # publish the new data by an atomic reference swap
+        self.data = x
+
+
+    def decodecsv(self, reply):
+        """ convert POI CSV data to a list of dicts """
         x = []
-        ii = 0;
-        for ln in csv.reader(reply.splitlines(),delimiter=';'):
-            if ii==0:
-                # column names
-                names = ln
-            elif ii==1:
-                # units
-                units = ln
-            elif ii==2:
-                # german column names
-                gnames = ln
+        # io.StringIO lets csv.reader iterate the lines lazily instead
+        # of materializing the splitlines() list first
+        reader = csv.reader(io.StringIO(reply),delimiter=';')
+        # header: column names, units and german column names
+        names = next(reader)
+        units = next(reader)
+        gnames = next(reader)
+        # per-column metadata, invariant across rows
+        colmeta = []
+        for idx in range(len(names)):
+            col = DWDPOIthread.OBS.get(names[idx])
+            unit = DWDPOIthread.UNIT.get(units[idx],units[idx])
+            if unit=='degree_C':
+                grp = 'group_temperature'
+            elif unit=='percent':
+                grp = 'group_percent'
             else:
-                # data lines
-                dt = ln[0].split('.')
-                ti = ln[1].split(':')
-                d = datetime.datetime(int(dt[2])+2000,int(dt[1]),int(dt[0]),int(ti[0]),int(ti[1]),0,tzinfo=datetime.timezone(datetime.timedelta(),'UTC'))
-                y = dict()
-                y['dateTime'] = (int(d.timestamp()),'unix_epoch','group_time')
-                y['interval'] = (60,'minute','group_interval')
-                for idx,val in enumerate(ln):
-                    if idx==0:
-                        y['date'] = (val,None,None)
-                    elif idx==1:
-                        y['time'] = (val,None,None)
-                    else:
-                        col = DWDPOIthread.OBS.get(names[idx])
-                        unit = DWDPOIthread.UNIT.get(units[idx],units[idx])
-                        if unit=='degree_C':
-                            grp = 'group_temperature'
-                        elif unit=='percent':
-                            grp = 'group_percent'
-                        else:
-                            grp = weewx.units.obs_group_dict.get(col)
-                        if col and val is not None:
-                            y[col] = (DWDPOIthread.to_float(val),
-                                      unit,
-                                      grp)
-                wwcode = DWDPOIthread.get_ww(y['presentWeather'][0],0)
-                if wwcode:
-                    y['icon'] = (wwcode[self.iconset],None,None)
-                    y['icontitle'] = (wwcode[1],None,None)
-                x.append(y)
-            ii += 1
-        try:
-            self.lock.acquire()
-            self.data = x
-        finally:
-            self.lock.release()
+                grp = weewx.units.obs_group_dict.get(col)
+            colmeta.append((col,unit,grp))
+        # data lines
+        for ln in reader:
+            day,month,year = ln[0].split('.',2)
+            hour,minute = ln[1].split(':',1)
+            # the timestamps are UTC, so plain integer arithmetic
+            # is sufficient and cheaper than constructing a
+            # timezone aware datetime instance for every row
+            ts = calendar.timegm((int(year)+2000,int(month),int(day),int(hour),int(minute),0,0,0,0))
+            y = dict()
+            y['dateTime'] = (ts,'unix_epoch','group_time')
+            y['interval'] = DWDPOIthread.INTERVAL_VT
+            for idx,val in enumerate(ln):
+                if idx==0:
+                    y['date'] = (val,None,None)
+                elif idx==1:
+                    y['time'] = (val,None,None)
+                else:
+                    col,unit,grp = colmeta[idx]
+                    if col and val is not None:
+                        y[col] = (DWDPOIthread.to_float(val),
+                                  unit,
+                                  grp)
+            wwcode = DWDPOIthread.get_ww(y['presentWeather'][0],0)
+            if wwcode:
+                y['icon'] = (wwcode[self.iconset],None,None)
+                y['icontitle'] = (wwcode[1],None,None)
+            x.append(y)
+            # the report is in reverse chronological order and only
+            # the latest reading is used, so there is no need to
+            # parse the older rows
+            break
+        return x
+
+
+    def decodecsv_pandas(self, reply):
+        """ convert POI CSV data to a list of dicts using pandas
+
+            pandas tokenizes and converts the values in C code, which
+            is considerably faster than the pure Python loop in
+            decodecsv(). pandas is optional. If it is not available,
+            decodecsv() is used.
+        """
+        # splitlines() also removes the '\r' of the CRLF line endings
+        # the DWD server sends, which would otherwise stick to the
+        # last column name and unit
+        lns = reply.splitlines()
+        names = lns[0].split(';')
+        units = lns[1].split(';')
+        # `na_values` covers the same missing value sentinels to_float()
+        # recognizes in the pure Python parser
+        # the report is in reverse chronological order and only the
+        # latest reading is used, so one data row is enough
+        df = pandas.read_csv(io.StringIO(reply),sep=';',skiprows=[1,2],
+                             decimal=',',na_values=['--','---'],nrows=1)
+        # date and time (UTC)
+        # divide by a Timedelta instead of casting to int64: the epoch
+        # is then independent of the datetime resolution, which is
+        # nanoseconds up to pandas 2.x but microseconds in pandas 3.x
+        dateTime = (pandas.to_datetime(
+            df.iloc[:,0]+' '+df.iloc[:,1],
+            format='%d.%m.%y %H:%M',utc=True)
+            -pandas.Timestamp(0,tz='UTC'))//pandas.Timedelta(seconds=1)
+        # per-column metadata, invariant across rows
+        colmeta = []
+        for idx in range(len(names)):
+            col = DWDPOIthread.OBS.get(names[idx])
+            unit = DWDPOIthread.UNIT.get(units[idx],units[idx])
+            if unit=='degree_C':
+                grp = 'group_temperature'
+            elif unit=='percent':
+                grp = 'group_percent'
+            else:
+                grp = weewx.units.obs_group_dict.get(col)
+            colmeta.append((col,unit,grp))
+        x = []
+        for i in range(len(df)):
+            y = dict()
+            y['dateTime'] = (int(dateTime.iat[i]),'unix_epoch','group_time')
+            y['interval'] = DWDPOIthread.INTERVAL_VT
+            y['date'] = (df.iat[i,0],None,None)
+            y['time'] = (df.iat[i,1],None,None)
+            for idx in range(2,len(names)):
+                col,unit,grp = colmeta[idx]
+                if not col: continue
+                val = df.iat[i,idx]
+                if pandas.isna(val):
+                    val = None
+                elif col=='presentWeather':
+                    # used as index into DWDPOIthread.WEATHER
+                    val = int(val)
+                else:
+                    val = float(val)
+                y[col] = (val,unit,grp)
+            wwcode = DWDPOIthread.get_ww(y['presentWeather'][0],0)
+            if wwcode:
+                y['icon'] = (wwcode[self.iconset],None,None)
+                y['icontitle'] = (wwcode[1],None,None)
+            x.append(y)
+        return x
+
+
+# precomputed once at import time: (observation type suffix, unit group)
+# pairs for the prefixed observation types DWDPOIthread provides
+_POI_OBS_GROUPS = []
+for _obstype in DWDPOIthread.OBS.values():
+    if _obstype=='visibility':
+        _obsgroup = 'group_distance'
+    else:
+        _obsgroup = weewx.units.obs_group_dict.get(_obstype)
+    if _obsgroup:
+        _POI_OBS_GROUPS.append((_obstype[0].upper()+_obstype[1:],_obsgroup))
 
 
 class DWDCDCthread(BaseThread):
@@ -1350,8 +1475,9 @@ class DWDOPENMETEOthread(BaseThread):
         return data,interval
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_ww(wwcode, night):
-        """ get weather description from value of 'wwcode' 
+        """ get weather description from value of 'wwcode'
             returns: (german_text,english_text,'','',belchertown_icon,dwd_icon,aeris_icon)
         """
         try:
@@ -1633,6 +1759,9 @@ class DWDOPENMETEOthread(BaseThread):
 
 class DWDservice(StdService):
 
+    # observation types that are not converted to archive record columns
+    SKIP_KEYS = frozenset(('interval','count','sysStatus'))
+
     def __init__(self, engine, conf_dict):
         super(DWDservice,self).__init__(engine, conf_dict)
         
@@ -1937,8 +2066,6 @@ class DWDservice(StdService):
 
 
     def new_loop_packet(self, event):
-        #for thread_name in self.threads:
-        #    pass
         # remember outTemp and outHumidty for later use
         try:
             if self.dwdxtype:
@@ -1946,11 +2073,12 @@ class DWDservice(StdService):
         except (LookupError,TypeError,ValueError,ArithmeticError,OSError) as e:
             # reported once every 5 minutes only
             if self.next_loop_error_ts<time.time():
-                logerr("dwdxtype.remember() %s %s" % (e.__class__.__name__))
+                logerr("dwdxtype.remember() %s %s" % (e.__class__.__name__,e))
                 self.next_loop_error_ts = time.time()+300
     
     
     def new_archive_record(self, event):
+        if not self.threads: return
         elapsed = list()
         ts = event.record.get('dateTime',time.time())
         for thread_name in self.threads:
@@ -2005,24 +2133,43 @@ class DWDservice(StdService):
 
     def _to_weewx(self, thread_name, reply, usUnits):
         prefix = self.threads[thread_name]['prefix']
+        # map of observation type to prefixed archive column name,
+        # filled on first use and reused for all subsequent records of
+        # the same thread
+        key_map = self.threads[thread_name].setdefault('key_map',dict())
+        # conversion functions resolved once per source unit, unit
+        # group and target unit system, and reused for all records
+        conv_map = self.threads[thread_name].setdefault('conv_map',dict())
         data = dict()
         for key in reply:
             #print('*',key)
-            if key in ('interval','count','sysStatus') or (key=='dateTime' and not prefix):
+            if key in DWDservice.SKIP_KEYS or (key=='dateTime' and not prefix):
                 pass
-            elif key in ('interval','count'):
-                data[key] = reply[key]
             else:
                 try:
                     val = reply[key]
-                    val = weewx.units.convertStd(val, usUnits)[0]
+                    ckey = (val[1],val[2],usUnits)
+                    conv = conv_map.get(ckey)
+                    if conv is None:
+                        target_unit = weewx.units.StdUnitConverters[usUnits].group_unit_dict.get(val[2])
+                        if target_unit is None or target_unit==val[1]:
+                            # no conversion required
+                            conv = False
+                        else:
+                            conv = weewx.units.conversionDict[val[1]][target_unit]
+                        conv_map[ckey] = conv
+                    val = conv(val[0]) if conv and val[0] is not None else val[0]
                 except (TypeError,ValueError,LookupError,ArithmeticError) as e:
                     try:
                         val = reply[key][0]
                     except LookupError:
                         val = None
                 if prefix:
-                    data[prefix+key[0].upper()+key[1:]] = val
+                    okey = key_map.get(key)
+                    if okey is None:
+                        okey = prefix+key[0].upper()+key[1:]
+                        key_map[key] = okey
+                    data[okey] = val
                 else:
                     data[key] = val
         return data
@@ -85,12 +85,28 @@ import weewx.units
 for group in weewx.units.std_groups:
     weewx.units.std_groups[group].setdefault('group_coordinate','degree_compass')
 
-def wget(url, log_success=False, log_failure=True, session=requests):
-    """ download  """
+def wget(url, log_success=False, log_failure=True, session=requests, cache=None):
+    """ download
+
+        If `cache` is a dict, a conditional request is issued using the
+        ETag and Last-Modified headers remembered from the previous
+        download of the same URL. If the server replies 304 Not
+        Modified, the cached content is returned and the cache entry
+        is marked `not_modified`, so the caller can skip processing
+        data that did not change.
+    """
     elapsed = time.time()
     headers={'User-Agent':'weewx-DWD'}
+    cached = cache.get(url) if cache is not None else None
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
     try:
-        reply = session.get(url, headers=headers, timeout=5)
+        # separate connect and read timeouts: connecting should be
+        # fast, but reading a large reply may take longer
+        reply = session.get(url, headers=headers, timeout=(5,30))
     except requests.exceptions.Timeout:
         if log_failure:
             logerr('timeout downloading %s' % url)
@@ -100,9 +116,20 @@ def wget(url, log_success=False, log_failure=True, session=requests):
     reply_url = reply.url.split('?')[0]
 
     if reply.status_code==200:
+        if cache is not None:
+            cache[url] = {
+                'etag':reply.headers.get('ETag'),
+                'last_modified':reply.headers.get('Last-Modified'),
+                'content':reply.content,
+                'not_modified':False}
         if log_success:
             loginf('successfully downloaded %s in %.2f seconds' % (reply_url,elapsed))
         return reply.content
+    elif reply.status_code==304 and cached:
+        cached['not_modified'] = True
+        if log_success:
+            loginf('%s not modified since last download' % reply_url)
+        return cached['content']
     else:
         if log_failure:
             logerr('error downloading %s: %s %s' % (reply_url,reply.status_code,reply.reason))